@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os
+import threading
 import time
 import json
 import logging
@@ -19,6 +20,8 @@ class BaseClient:
         self.session = requests.Session()
         self.timeout = timeout
         self._last_request_ts: float = 0.0
+        # Serialises pacing when one client is shared by several threads
+        self._rate_lock = threading.Lock()
 
     def _respect_rate_limit(self):
         if not self.RATE_LIMIT_RPS_ENV:
@@ -33,11 +36,12 @@ class BaseClient:
         except ValueError:
             return
         min_interval = 1.0 / rps
-        now = time.time()
-        elapsed = now - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        with self._rate_lock:
+            now = time.time()
+            elapsed = now - self._last_request_ts
+            if elapsed < min_interval:
+                time.sleep(min_interval - elapsed)
+            self._last_request_ts = time.time()
 
     def _request(self, method: str, path: str, *, params: Dict[str, Any] | None = None, headers: Dict[str, str] | None = None, json_body: Any | None = None, retries: int = 2) -> Any:
         url = path if path.startswith('http') else self.BASE_URL.rstrip('/') + '/' + path.lstrip('/')
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import json
 import hashlib
+import os
 import time
 from pathlib import Path
 from typing import Any, Optional
@@ -22,7 +23,7 @@ def cache_path(provider: str, key_parts: list[str]) -> Path:
     return prov_dir / f"{_hash_key(key_parts)}.json"
 
 
-def load_cache(provider: str, key_parts: list[str], ttl_seconds: int) -> Optional[Any]:
+def _fresh_cache_path(provider: str, key_parts: list[str], ttl_seconds: int) -> Optional[Path]:
     p = cache_path(provider, key_parts)
     if not p.exists():
         return None
@@ -30,12 +31,39 @@ def load_cache(provider: str, key_parts: list[str], ttl_seconds: int) -> Optiona
         age = time.time() - p.stat().st_mtime
         if age > ttl_seconds:
             return None
+    return p
+
+
+def load_cache(provider: str, key_parts: list[str], ttl_seconds: int) -> Optional[Any]:
+    p = _fresh_cache_path(provider, key_parts, ttl_seconds)
+    if p is None:
+        return None
     try:
         return json.loads(p.read_text(encoding='utf-8'))
     except Exception:
         return None
 
 
+def load_cache_bytes(provider: str, key_parts: list[str], ttl_seconds: int) -> Optional[bytes]:
+    """Return the stored JSON payload as raw bytes (no re-encode round trip).
+
+    The payload is still parsed once so a corrupt/truncated entry is treated as a
+    miss (None), exactly like ``load_cache``.
+    """
+    p = _fresh_cache_path(provider, key_parts, ttl_seconds)
+    if p is None:
+        return None
+    try:
+        raw = p.read_bytes()
+        json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    return raw
+
+
 def save_cache(provider: str, key_parts: list[str], data: Any) -> None:
     p = cache_path(provider, key_parts)
-    p.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    # Write to a sibling temp file and rename, so readers never see a partially written entry
+    tmp = p.with_name(f'{p.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    os.replace(tmp, p)
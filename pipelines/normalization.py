@@ -126,7 +126,7 @@ def normalize_ebay_search(items: List[Dict[str, Any]], raw_file: str, raw_hash:
 
 
 def merge_products(existing, new_records, key_mode: str = 'triple') -> tuple:
-    """Merge new product records into existing dataframe.
+    """Merge new product records (list of dicts or a DataFrame) into existing dataframe.
 
     Returns:
       (combined_df_or_records, new_count, updated_count)
@@ -139,21 +139,27 @@ def merge_products(existing, new_records, key_mode: str = 'triple') -> tuple:
         # Fallback sem pandas: considera todos novos (sem updated tracking)
         return new_records, len(new_records), 0
     import pandas as _pd
-    df_new = _pd.DataFrame(new_records)
+    df_new = new_records if isinstance(new_records, _pd.DataFrame) else _pd.DataFrame(new_records)
     if existing is None or existing.empty:
         if key_mode == 'pair' and not df_new.empty:
             df_new = df_new.sort_values('collected_at').drop_duplicates(['source','source_id'], keep='last')
         return df_new, len(df_new), 0
+    if df_new.empty:
+        # Empty batch: nothing to add or overwrite (an empty DataFrame has no key columns)
+        if key_mode == 'triple':
+            return _pd.concat([existing, df_new], ignore_index=True), 0, 0
+        if key_mode == 'pair':
+            return existing, 0, 0
 
     if key_mode == 'triple':
         key_cols = ['source','source_id','raw_hash']
         existing_keys = set(tuple(r) for r in existing[key_cols].values.tolist())
-        mask = [tuple(row[k] for k in key_cols) not in existing_keys for row in df_new.to_dict('records')]
+        mask = [k not in existing_keys for k in zip(*(df_new[c] for c in key_cols))]
         df_filtered = df_new[mask]
         combined = _pd.concat([existing, df_filtered], ignore_index=True)
         return combined, len(df_filtered), 0
     elif key_mode == 'pair':
-        new_keys = set((r['source'], r['source_id']) for r in df_new.to_dict('records'))
+        new_keys = set(zip(df_new['source'], df_new['source_id']))
         if new_keys:
             existing_filtered = existing[[ (row_source, row_source_id) not in new_keys for row_source, row_source_id in existing[['source','source_id']].values ]]
         else:
@@ -161,7 +167,7 @@ def merge_products(existing, new_records, key_mode: str = 'triple') -> tuple:
         if 'collected_at' in df_new.columns:
             df_new = df_new.sort_values('collected_at').drop_duplicates(['source','source_id'], keep='last')
         existing_pair_keys = set((r[0], r[1]) for r in existing[['source','source_id']].values)
-        new_unique_keys = set((r['source'], r['source_id']) for r in df_new.to_dict('records'))
+        new_unique_keys = set(zip(df_new['source'], df_new['source_id']))
         truly_new = len([k for k in new_unique_keys if k not in existing_pair_keys])
         updated_count = len([k for k in new_unique_keys if k in existing_pair_keys])
         combined = _pd.concat([existing_filtered, df_new], ignore_index=True)
@@ -0,0 +1,105 @@
+"""I/O helpers shared by generate_figures.py and generate_comparative_report.py.
+
+generate_figures.py writes the numeric series it already computes (coerced
+prices and order values) to reports/_cache/*.parquet; the report reuses them instead of re-coercing the raw columns, as long as the cache
+is at least as new as the source dataset. ``to_float`` is the shared numeric
+coercion used by both scripts, and ``read_table`` the shared dataset loader:
+both scripts go through one process-local cache keyed by (path, mtime_ns), so a
+dataset is decoded once per process and re-read only if the file changes.
+"""
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+except ImportError:  # to_float falls back to pd.to_numeric
+    pa = pc = None  # type: ignore
+try:
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # schema peek falls back to a full read
+    pq = None  # type: ignore
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / 'reports' / '_cache'
+# Order date/value columns, in order of preference: figures and report pick the same ones
+ORDER_DATE_CANDIDATES = ['created_at','order_date','date','timestamp']
+ORDER_VALUE_CANDIDATES = ['total_price','total','amount','grand_total','price']
+# Arrow-backed columns: strings stay in Arrow buffers, so value_counts/groupby hash them natively
+_ARROW_BACKEND = {'dtype_backend': 'pyarrow'} if pa is not None else {}
+
+
+@lru_cache(maxsize=16)
+def _columns(path: str, mtime_ns: int) -> tuple[str, ...]:
+    if path.lower().endswith('.parquet'):
+        if pq is not None:
+            return tuple(pq.ParquetFile(path).schema_arrow.names)
+        return tuple(pd.read_parquet(path).columns)
+    return tuple(pd.read_csv(path, nrows=0).columns)
+
+
+@lru_cache(maxsize=8)
+def _read(path: str, mtime_ns: int, columns: tuple[str, ...] | None) -> pd.DataFrame:
+    cols = list(columns) if columns is not None else None
+    if path.lower().endswith('.parquet'):
+        return pd.read_parquet(path, columns=cols, **_ARROW_BACKEND)
+    if cols == []:
+        # usecols=[] drops the rows too; keep the row count with an empty projection
+        return pd.read_csv(path, usecols=[0]).iloc[:, :0]
+    return pd.read_csv(path, usecols=cols, **_ARROW_BACKEND)
+
+
+def table_columns(path: Path) -> list[str]:
+    """Column names of a parquet/CSV file, read from the schema/header only."""
+    return list(_columns(str(path), path.stat().st_mtime_ns))
+
+
+def read_table(path: Path, columns: tuple[str, ...] | None = None) -> pd.DataFrame | None:
+    """Load ``path`` (optionally only ``columns``), memoized per process; None if missing.
+
+    The returned frame is shared between callers and must not be mutated.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read(str(path), mtime_ns, columns)
+
+
+def write_kpi_cache(name: str, frame: pd.DataFrame) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    frame.to_parquet(CACHE_DIR / f'{name}.parquet', index=False)
+
+
+def read_kpi_cache(name: str, source: Path | None) -> pd.DataFrame | None:
+    """Return the cached frame if it is not older than ``source``, else None."""
+    if source is None:
+        return None
+    cache = CACHE_DIR / f'{name}.parquet'
+    try:
+        if cache.stat().st_mtime < source.stat().st_mtime:
+            return None
+        return pd.read_parquet(cache)
+    except Exception:
+        return None
+
+
+def to_float(s: pd.Series) -> pd.Series:
+    """Float64 coercion equivalent to ``pd.to_numeric(s, errors='coerce')``.
+
+    Numeric columns pass straight through; string columns are cast by Arrow's
+    C++ kernel. Arrow rejects the whole array on any unparsable value, in which
+    case we fall back to pandas' element-wise coercion.
+    """
+    if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        return pd.Series(s.to_numpy(dtype='float64', na_value=np.nan), index=s.index, name=s.name)
+    if pc is not None:
+        try:
+            arr = pc.cast(pa.array(s, from_pandas=True), pa.float64(), safe=False)
+            return pd.Series(arr.to_numpy(zero_copy_only=False), index=s.index, name=s.name)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+    return pd.to_numeric(s, errors='coerce').astype('float64')
@@ -7,9 +7,9 @@ Usage:
 Without flags runs basic variable presence checks. Use --shopify to test Shopify /shop.json.
 """
 from __future__ import annotations
-import os, sys, json, textwrap
+import os, sys, json, textwrap, argparse
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Mapping, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
@@ -19,12 +19,13 @@ def load_env_file(env_path: Path) -> None:
     if not env_path.exists():
         return
     try:
-        for line in env_path.read_text(encoding='utf-8').splitlines():
+        for line in env_path.read_bytes().splitlines():
             line = line.strip()
-            if not line or line.startswith('#') or '=' not in line:
+            if not line or line[:1] == b'#' or b'=' not in line:
                 continue
-            k,v = line.split('=',1)
-            k = k.strip(); v = v.strip().strip('"').strip("'")
+            k, _, v = line.partition(b'=')
+            k = k.strip().decode('utf-8', 'replace')
+            v = v.strip().strip(b'"').strip(b"'").decode('utf-8', 'replace')
             if not k:
                 continue
             existing = os.environ.get(k)
@@ -43,35 +44,41 @@ MANDATORY: Dict[str, List[str]] = {
 
 OPTIONAL_LIMITERS = ['SHOPIFY_RPS','AMAZON_PAAPI_RPS','EBAY_RPS']
 
+SHOPIFY_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+BODY_PREVIEW_BYTES = 300
+
 def mask(val: str | None) -> str | None:
     if not val:
         return val
-    if len(val) <= 6:
-        return '*' * len(val)
-    return val[:4] + '...' + val[-4:]
+    n = len(val)
+    long_val = n > 6
+    head, tail = (val[:4], val[-4:]) if long_val else ('', '')
+    return head + ('...' if long_val else '*' * n) + tail
 
-def check_presence() -> Dict[str, Dict[str, str]]:
-    report: Dict[str, Dict[str, str]] = {}
+def check_presence(env: Mapping[str, str]) -> Dict[str, Dict[str, Tuple[str, str | None]]]:
+    """Map provider -> {var: (status, masked_value)} with a single lookup per variable."""
+    report: Dict[str, Dict[str, Tuple[str, str | None]]] = {}
     for prov, keys in MANDATORY.items():
         prov_map = {}
         for k in keys:
-            v = os.getenv(k)
-            prov_map[k] = 'OK' if v and v.strip() else 'MISSING'
+            v = env.get(k)
+            status = 'OK' if v and v.strip() else 'MISSING'
+            prov_map[k] = (status, mask(v) if status == 'OK' else None)
         report[prov] = prov_map
     return report
 
 def print_report():
-    presence = check_presence()
+    env = os.environ
+    presence = check_presence(env)
     print('\n[VARIABLE PRESENCE]')
     widest = max(len(k) for keys in MANDATORY.values() for k in keys)
     for prov, mapping in presence.items():
         print(f"- {prov.upper()}:")
-        for k, status in mapping.items():
-            raw = os.getenv(k)
-            print(f"  {k.ljust(widest)} : {status:<8} {'' if status!='OK' else mask(raw)}")
+        for k, (status, masked) in mapping.items():
+            print(f"  {k.ljust(widest)} : {status:<8} {masked or ''}")
     print('\n[OPTIONAL LIMITERS]')
     for k in OPTIONAL_LIMITERS:
-        raw = os.getenv(k)
+        raw = env.get(k)
         if raw:
             print(f"  {k} = {raw}")
     print()
@@ -88,12 +95,17 @@ def test_shopify():
     url = f"https://{domain}/admin/api/{version}/shop.json"
     print(f"[shopify] GET {url}")
     try:
-        resp = requests.get(url, headers={'X-Shopify-Access-Token': token, 'Accept':'application/json'}, timeout=20)
+        # (connect, read) timeouts: fail fast on bad domains; stream so only the preview is downloaded
+        resp = requests.get(url, headers={'X-Shopify-Access-Token': token, 'Accept':'application/json'}, timeout=SHOPIFY_TIMEOUT, stream=True)
+        try:
+            preview = resp.raw.read(BODY_PREVIEW_BYTES, decode_content=True)
+        finally:
+            resp.close()
     except Exception as e:
         print(f"[shopify] ERROR network: {e}")
         return
     print(f"[shopify] Status: {resp.status_code}")
-    body = resp.text[:300].replace('\n',' ')
+    body = preview.decode('utf-8', 'replace').replace('\n',' ')
     print(f"[shopify] Body  : {body}")
     if resp.status_code == 404:
         print(textwrap.dedent("""
@@ -103,12 +115,19 @@ def test_shopify():
         print("HINT 401/403: Invalid token, missing required scopes, or app not installed.")
 
 
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description='Environment & connectivity diagnostics for API providers.')
+    ap.add_argument('--shopify', action='store_true', help='Test Shopify connectivity (/shop.json).')
+    ap.add_argument('--all', action='store_true', help='Run every available connectivity test.')
+    return ap.parse_args(argv[1:])
+
+
 def main(argv: List[str]):
-    flags = set(a for a in argv[1:] if a.startswith('--'))
+    args = parse_args(argv)
     print_report()
-    if '--shopify' in flags or '--all' in flags:
+    if args.shopify or args.all:
         test_shopify()
-    if '--all' in flags:
+    if args.all:
         # Future: add lightweight Amazon / eBay connectivity tests
         pass
 
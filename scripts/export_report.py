@@ -13,12 +13,14 @@ Usage:
 from __future__ import annotations
 from pathlib import Path
 import argparse, sys, subprocess, shutil
+from collections import deque
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 REPORT_MD = PROJECT_ROOT / 'reports' / 'comparative_report.md'
 REPORT_HTML = PROJECT_ROOT / 'reports' / 'comparative_report.html'
 REPORT_PDF = PROJECT_ROOT / 'reports' / 'comparative_report.pdf'
 BRAND_LOGO = PROJECT_ROOT / 'brand' / 'png' / 'icon_cart_growth_default_256.png'
+PANDOC_STDERR_TAIL_LINES = 100
 
 CSS = """
 body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Cantarell, 'Helvetica Neue', Arial, sans-serif; margin: 2rem; line-height:1.5; }
@@ -80,12 +82,14 @@ def html_to_pdf():
     # Try fallback: pandoc if installed
     if shutil.which('pandoc'):
         cmd = ['pandoc', str(REPORT_HTML), '-o', str(REPORT_PDF)]
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        if res.returncode == 0:
+        # Stream stderr and keep only the tail; pandoc warnings can be large and are only shown on failure
+        with subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True) as proc:
+            err_tail = deque(proc.stderr, maxlen=PANDOC_STDERR_TAIL_LINES)
+        if proc.returncode == 0:
             print('PDF written via pandoc to', REPORT_PDF)
             return
         else:
-            print('Pandoc failed:', res.stderr)
+            print('Pandoc failed:', ''.join(err_tail))
     # Minimal fallback: create plain-text PDF using reportlab (if available)
     try:
         from reportlab.lib.pagesizes import A4
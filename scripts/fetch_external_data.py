@@ -16,6 +16,7 @@ Options:
 from __future__ import annotations
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 import os
@@ -25,24 +26,37 @@ def _load_env_file(env_path: Path) -> None:
     if not env_path.exists():
         return
     try:
-        for line in env_path.read_text(encoding='utf-8').splitlines():
+        for line in env_path.read_bytes().splitlines():
             line = line.strip()
-            if not line or line.startswith('#') or '=' not in line:
+            if not line or line[:1] == b'#' or b'=' not in line:
                 continue
-            k, v = line.split('=',1)
-            k = k.strip(); v = v.strip().strip('"').strip("'")
+            k, _, v = line.partition(b'=')
+            k = k.strip().decode('utf-8', 'replace')
+            v = v.strip().strip(b'"').strip(b"'").decode('utf-8', 'replace')
             existing = os.environ.get(k)
             if existing is None or existing.strip() == '':
                 os.environ[k] = v
     except Exception:
         pass
 
-_load_env_file(Path('.env'))
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_ENV_LOADED = False
+
+
+def _ensure_env_loaded() -> None:
+    """Load the project-root .env once, independent of the current working directory."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    _load_env_file(_PROJECT_ROOT / '.env')
+    _ENV_LOADED = True
+
+_ensure_env_loaded()
 
 from integrations.shopify_client import ShopifyClient
 from integrations.amazon_paapi_client import AmazonPAAPIClient
 from integrations.ebay_client import EbayClient
-from integrations.cache import load_cache, save_cache
+from integrations.cache import load_cache_bytes, save_cache
 
 
 def parse_args():
@@ -61,6 +75,35 @@ def parse_args():
     return p.parse_args()
 
 
+AMAZON_BATCH_SIZE = 10  # PA-API GetItems limit per request
+AMAZON_MAX_WORKERS = 4
+
+
+def _get_amazon_items(client: AmazonPAAPIClient, asin_list: List[str]) -> dict:
+    """Fetch ASINs in batches of 10, issuing batches concurrently within the RPS budget."""
+    chunks = [asin_list[i:i + AMAZON_BATCH_SIZE] for i in range(0, len(asin_list), AMAZON_BATCH_SIZE)]
+    if len(chunks) <= 1:
+        return client.get_items(asin_list)
+    try:
+        rps = float(os.getenv('AMAZON_PAAPI_RPS') or 0)
+    except ValueError:
+        rps = 0
+    # Without a configured RPS stay sequential (PA-API defaults to 1 TPS); the client's
+    # rate limiter is shared and locked, so concurrent batches still respect the budget.
+    workers = max(1, min(AMAZON_MAX_WORKERS, len(chunks), int(rps))) if rps > 0 else 1
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        parts = list(ex.map(client.get_items, chunks))
+    items: list = []
+    errors: list = []
+    for part in parts:
+        items.extend(part.get('ItemsResult', {}).get('Items', []))
+        errors.extend(part.get('Errors', []))
+    data: dict = {'ItemsResult': {'Items': items}}
+    if errors:
+        data['Errors'] = errors
+    return data
+
+
 def main():
     args = parse_args()
     provider = args.provider
@@ -78,11 +121,12 @@ def main():
         cache_key.append(args.query)
 
     if not args.no_cache:
-        cached = load_cache('cli', cache_key, ttl_seconds=args.ttl)
-        if cached is not None:
+        # save_cache stores the same indented JSON we emit, so a hit is a straight byte copy
+        raw = load_cache_bytes('cli', cache_key, ttl_seconds=args.ttl)
+        if raw:
             if args.verbose:
                 print('[cache-hit] Returning cached result')
-            out_path.write_text(json.dumps(cached, ensure_ascii=False, indent=2), encoding='utf-8')
+            out_path.write_bytes(raw)
             return
 
     if provider == 'shopify':
@@ -99,7 +143,7 @@ def main():
             if not args.ids:
                 raise SystemExit('--ids required for amazon items')
             asin_list: List[str] = [x.strip() for x in args.ids.split(',') if x.strip()]
-            data = client.get_items(asin_list)
+            data = _get_amazon_items(client, asin_list)
         else:
             raise SystemExit('Unsupported Amazon resource')
     elif provider == 'ebay':
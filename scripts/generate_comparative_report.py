@@ -11,10 +11,35 @@ Idempotent & defensive: skips sections gracefully if data missing.
 """
 from __future__ import annotations
 import os, json, math, textwrap, argparse, sys, hashlib
+from functools import reduce
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Callable, Iterable
+import numpy as np
 import pandas as pd
 
+try:  # imported as scripts.<module> (python -m, tests, pipelines)
+    from scripts._report_io import (
+        ORDER_DATE_CANDIDATES, ORDER_VALUE_CANDIDATES, read_kpi_cache, read_table, table_columns, to_float,
+    )
+except ImportError:  # run as a script: scripts/ itself is on sys.path
+    from _report_io import (
+        ORDER_DATE_CANDIDATES, ORDER_VALUE_CANDIDATES, read_kpi_cache, read_table, table_columns, to_float,
+    )
+
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except ImportError:  # stdlib fallback (also accepts bytes)
+    orjson = None  # type: ignore
+    _json_loads = json.loads
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+except ImportError:  # key counts fall back to groupby
+    pa = pc = None  # type: ignore
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_NORM = PROJECT_ROOT / 'data' / 'normalized'
 DATA_ENRICHED = PROJECT_ROOT / 'data' / 'enriched'
@@ -22,102 +47,105 @@ FIG_DIR = PROJECT_ROOT / 'reports' / 'figures'
 REPORTS_DIR = PROJECT_ROOT / 'reports'
 OUTPUT_MD = REPORTS_DIR / 'comparative_report.md'
 OUTPUT_JSON = REPORTS_DIR / 'comparative_report.json'
+SCHEMA_PATH = PROJECT_ROOT / 'schemas' / 'comparative_report.schema.json'
+RUN_LOG = PROJECT_ROOT / 'pipeline_runs.jsonl'
+
+
+# Candidate columns each KPI section may touch; only these are decoded from the inputs.
+REQUIRED_COLS = {
+    'products': frozenset(['source', 'source_id', 'category', 'price', 'price_amount']),
+    'orders': frozenset(['source', *ORDER_DATE_CANDIDATES, *ORDER_VALUE_CANDIDATES]),
+}
+RUN_METRIC_KEYS = ['new_products','updated_products','new_orders','updated_orders']
+PRICE_QUANTILES = [0.0, 0.25, 0.5, 0.75, 0.9, 1.0]  # min, q1, median, q3, p90, max
+# Enriched frames: derived column names come from the parquet schema; only aggregated columns are decoded.
+ENRICHED_AGG_COLS = {
+    'products': ['price_bucket'],
+    'orders': ['gmv_7d','orders_7d','aov_7d'],
+}
+
+
+def is_products_enriched_col(c: str) -> bool:
+    return c.startswith('price_') or c.endswith('_freq')
+
+
+def is_orders_enriched_col(c: str) -> bool:
+    return c.endswith('_7d') or c.startswith('recency') or c == 'order_value_num'
+
+EXPECTED_FIGURES = [
+    'products_price_distributions.png',
+    'orders_time_series.png',
+    'orders_aov_distribution.png'
+]
+
+_NARRATIVE_TEXT = textwrap.dedent('''
+The product dataset establishes the commercial catalog footprint (source diversity, category concentration and price dispersion), while the
+orders dataset captures temporal demand and monetary performance. Provider (source) breakdowns reveal distribution of catalog and demand.
+
+Engineered features enable downstream tasks:
+- Price segmentation and elasticity exploration (`price_bucket`, `price_log`).
+- Supplier/source reliability & concentration (`source_freq`).
+- Momentum & short‑term commercial monitoring (`gmv_7d`, `orders_7d`, `aov_7d`).
+- Lifecycle / churn proxy via recency (`recency_days`).
+
+Data Quality & Risk Observations:
+- Outlier ratios contextualize pricing anomalies for potential cleansing or curation steps.
+- Duplicate logical key pairs (source + source_id) indicate upstream id uniformity or merge correctness.
+- Run log metrics (new_* vs updated_*) help track incremental ingestion health; rising updated/new ratio may signal dataset maturity or stagnation.
+
+Recommended Next Steps:
+1. Establish anomaly thresholds for price outliers and rolling GMV deltas.
+2. Persist daily aggregate tables for BI dashboards.
+3. Integrate simple forecasting (e.g., 7d GMV moving average horizon extension) for operations planning.
+''').strip()
 
-REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
 # --- CLI Args ---
-parser = argparse.ArgumentParser(description="Generate comparative markdown + JSON reports.")
-parser.add_argument('--json-only', action='store_true', help='Generate only the JSON (does not overwrite existing markdown).')
-parser.add_argument('--md-only', action='store_true', help='Generate only the markdown (skips JSON).')
-parser.add_argument('--fail-on-missing', action='store_true', help='Return exit code 2 if any essential dataset is missing.')
-parser.add_argument('--validate', action='store_true', help='Validate produced JSON against JSON Schema (schemas/comparative_report.schema.json).')
-args = parser.parse_args()
 
-if args.json_only and args.md_only:
-    print('Error: do not use --json-only and --md-only together.', file=sys.stderr)
-    sys.exit(1)
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate comparative markdown + JSON reports.")
+    parser.add_argument('--json-only', action='store_true', help='Generate only the JSON (does not overwrite existing markdown).')
+    parser.add_argument('--md-only', action='store_true', help='Generate only the markdown (skips JSON).')
+    parser.add_argument('--fail-on-missing', action='store_true', help='Return exit code 2 if any essential dataset is missing.')
+    parser.add_argument('--validate', action='store_true', help='Validate produced JSON against JSON Schema (schemas/comparative_report.schema.json).')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore numeric series cached by generate_figures.py (reports/_cache).')
+    return parser.parse_args(argv)
 
 # --- Helpers ---
 
-def load_df(preferred: Path, fallback: Path) -> pd.DataFrame | None:
-    if preferred.exists():
-        return pd.read_parquet(preferred)
-    if fallback.exists():
-        if fallback.suffix.lower() == '.parquet':
-            return pd.read_parquet(fallback)
-        return pd.read_csv(fallback)
+def find_input(preferred: Path, fallback: Path) -> Path | None:
+    for path in (preferred, fallback):
+        if path.exists():
+            return path.resolve()
     return None
 
-products = load_df(DATA_NORM / 'products.parquet', DATA_NORM / 'products.csv')
-orders = load_df(DATA_NORM / 'orders.parquet', DATA_NORM / 'orders.csv')
-products_enriched = load_df(DATA_ENRICHED / 'products_enriched.parquet', DATA_ENRICHED / 'products_enriched.csv')
-orders_enriched = load_df(DATA_ENRICHED / 'orders_enriched.parquet', DATA_ENRICHED / 'orders_enriched.csv')
-
-# JSON structure accumulator (schema_version incremented on structure change)
-json_report: dict[str, object] = {
-    '$schema': str(PROJECT_ROOT / 'schemas' / 'comparative_report.schema.json'),
-    'schema_version': '1.1.0',
-    'generated_at_utc': datetime.now(timezone.utc).isoformat(),
-    # Capture invocation context (basic – refined upstream if pipeline passes env vars)
-    'inputs': {
-        'providers': [],
-        'dedup_key_mode': os.environ.get('DEDUP_KEY_MODE', 'pair'),
-        'seed': None,
-        'limit': None,
-        'fake_mode': os.environ.get('FAKE_MODE', 'none')
-    },
-    'paths': {
-        'products': str(DATA_NORM / 'products.parquet'),
-        'orders': str(DATA_NORM / 'orders.parquet'),
-        'products_enriched': str(DATA_ENRICHED / 'products_enriched.parquet'),
-        'orders_enriched': str(DATA_ENRICHED / 'orders_enriched.parquet'),
-        'figures_dir': str(FIG_DIR)
-    },
-    'figures': [],  # will collect figures used in report
-    'products': {},
-    'orders': {},
-    'enriched': {},
-    'run_logs': {},
-    'data_availability': {},
-    'narrative': {},
-    'notes': {}
-}
 
-lines: list[str] = []
-brand_logo = None
-preferred_logo_candidates = [
-    PROJECT_ROOT / 'brand' / 'png' / 'icon_cart_growth_default_256.png',
-    PROJECT_ROOT / 'brand' / 'png' / 'icon_cart_growth_adaptive_256.png',
-]
-for cand in preferred_logo_candidates:
-    if cand.exists():
-        brand_logo = cand
-        break
-brand_title = 'Comparative Data Report'
-lines.append(f'# {brand_title}')
-lines.append('Generated: ' + datetime.now(timezone.utc).isoformat())
-if brand_logo:
-    rel_logo = os.path.relpath(brand_logo, REPORTS_DIR).replace('\\','/')
-    lines.append(f"<p align='right'><img src='{rel_logo}' alt='Brand Logo' width='96'/></p>")
-lines.append('')
-json_report.setdefault('narrative', {})['brand'] = {
-    'title': brand_title,
-    'logo': str(brand_logo) if brand_logo else None
-}
+def select_columns(path: Path, columns: Iterable[str] | Callable[[str], bool]) -> list[str]:
+    """Columns of ``path`` (schema order) that are named in / accepted by ``columns``."""
+    keep = columns if callable(columns) else set(columns).__contains__
+    return [c for c in table_columns(path) if keep(c)]
+
+
+def load_df(preferred: Path, fallback: Path, columns: Iterable[str] | Callable[[str], bool] | None = None) -> pd.DataFrame | None:
+    """Load a dataset once per process (cached by resolved path, mtime + projection).
+
+    ``columns`` restricts decoding to the named columns (or those matching a
+    predicate); names absent from the file are ignored.
+    """
+    path = find_input(preferred, fallback)
+    if path is None:
+        return None
+    projection = tuple(select_columns(path, columns)) if columns is not None else None
+    return read_table(path, projection)
+
+
+def load_enriched(preferred: Path, fallback: Path, derived: Callable[[str], bool], agg_cols: list[str]) -> tuple[pd.DataFrame | None, list[str]]:
+    """Return (frame with only ``agg_cols`` decoded, derived column names from the schema)."""
+    path = find_input(preferred, fallback)
+    if path is None:
+        return None, []
+    return read_table(path, tuple(select_columns(path, agg_cols))), select_columns(path, derived)
 
-# Attempt to read pipeline run logs (jsonl)
-RUN_LOG = PROJECT_ROOT / 'pipeline_runs.jsonl'
-run_logs: list[dict] = []
-if RUN_LOG.exists():
-    with RUN_LOG.open('r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                run_logs.append(json.loads(line))
-            except Exception:
-                continue
 
 def safe_number(x):
     try:
@@ -125,8 +153,127 @@ def safe_number(x):
     except Exception:
         return math.nan
 
-# --- Product KPIs ---
-if products is not None and len(products) > 0:
+
+def logical_key_counts(products: pd.DataFrame) -> np.ndarray:
+    """Row count per (source, source_id) key; rows with a null key part are ignored like groupby."""
+    keys = products[['source','source_id']].dropna()
+    if pc is None:
+        return keys.groupby(['source','source_id']).size().to_numpy()
+    # Join the key parts inside Arrow (no per-row Python strings) and hash the joined column once
+    src, sid = (pc.cast(pa.array(keys[c], from_pandas=True), pa.string()) for c in ('source', 'source_id'))
+    combo = pc.binary_join_element_wise(src, sid, '\x1f')
+    return pc.value_counts(combo).field('counts').to_numpy(zero_copy_only=False)
+
+
+def sorted_quantiles(arr: np.ndarray, qs: list[float]) -> np.ndarray:
+    """Linear-interpolated quantiles of an ascending array by direct indexing.
+
+    Same result as ``np.quantile``/``Series.quantile`` (including numpy's lerp
+    rounding) without re-partitioning the data for each call.
+    """
+    pos = np.asarray(qs, dtype=np.float64) * (arr.size - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, arr.size - 1)
+    t = pos - lo
+    a, b = arr[lo], arr[hi]
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def count_table(counts: pd.Series, total: int, label: str, key: str) -> tuple[list[str], list[dict]]:
+    """Markdown ``| label | Count | % |`` table + JSON records for a value_counts result.
+
+    Rows are formatted column-wise (vectorised string concatenation) rather than per row.
+    """
+    n = counts.to_numpy(dtype=np.int64)
+    ratios = n / total if total else np.zeros(len(n))
+    # Arrow-backed nulls would stringify as '<NA>'; keep the 'nan' label the report has always used
+    labels = counts.index.to_numpy(dtype=object, na_value=np.nan).astype(str)
+    # '%.2f%%' of ratio*100 is exactly what '{:.2%}' produces
+    parts = ['| ', labels, ' | ', n.astype(str), ' | ', np.char.mod('%.2f%%', ratios * 100), ' |']
+    rows = reduce(np.char.add, parts)
+    lines = [f'| {label} | Count | % |', '|--------|-------|----|', *rows.tolist()]
+    records = [{key: k, 'count': c, 'ratio': r} for k, c, r in zip(labels.tolist(), n.tolist(), ratios.tolist())]
+    return lines, records
+
+
+def _figure_entry(fig_path: Path, section: str) -> dict:
+    rel_path = os.path.relpath(fig_path, REPORTS_DIR).replace('\\','/')
+    return {'name': fig_path.name, 'path': rel_path, 'section': section}
+
+
+def new_json_report() -> dict[str, object]:
+    # JSON structure accumulator (schema_version incremented on structure change)
+    return {
+        '$schema': str(SCHEMA_PATH),
+        'schema_version': '1.1.0',
+        'generated_at_utc': datetime.now(timezone.utc).isoformat(),
+        # Capture invocation context (basic – refined upstream if pipeline passes env vars)
+        'inputs': {
+            'providers': [],
+            'dedup_key_mode': os.environ.get('DEDUP_KEY_MODE', 'pair'),
+            'seed': None,
+            'limit': None,
+            'fake_mode': os.environ.get('FAKE_MODE', 'none')
+        },
+        'paths': {
+            'products': str(DATA_NORM / 'products.parquet'),
+            'orders': str(DATA_NORM / 'orders.parquet'),
+            'products_enriched': str(DATA_ENRICHED / 'products_enriched.parquet'),
+            'orders_enriched': str(DATA_ENRICHED / 'orders_enriched.parquet'),
+            'figures_dir': str(FIG_DIR)
+        },
+        'figures': [],  # will collect figures used in report
+        'products': {},
+        'orders': {},
+        'enriched': {},
+        'run_logs': {},
+        'data_availability': {},
+        'narrative': {},
+        'notes': {}
+    }
+
+# --- Sections ---
+
+def build_header() -> list[str]:
+    lines: list[str] = []
+    brand_logo = None
+    preferred_logo_candidates = [
+        PROJECT_ROOT / 'brand' / 'png' / 'icon_cart_growth_default_256.png',
+        PROJECT_ROOT / 'brand' / 'png' / 'icon_cart_growth_adaptive_256.png',
+    ]
+    for cand in preferred_logo_candidates:
+        if cand.exists():
+            brand_logo = cand
+            break
+    brand_title = 'Comparative Data Report'
+    lines.append(f'# {brand_title}')
+    lines.append('Generated: ' + datetime.now(timezone.utc).isoformat())
+    if brand_logo:
+        rel_logo = os.path.relpath(brand_logo, REPORTS_DIR).replace('\\','/')
+        lines.append(f"<p align='right'><img src='{rel_logo}' alt='Brand Logo' width='96'/></p>")
+    lines.append('')
+    return lines
+
+
+def _cached_values(cache: pd.DataFrame | None, col: str) -> np.ndarray | None:
+    if cache is None or col not in cache.columns:
+        return None
+    return cache[col].to_numpy(dtype='float64')
+
+
+def compute_products_kpis(products: pd.DataFrame | None, price_cache: pd.DataFrame | None = None) -> tuple[list[str], dict, list[dict]]:
+    """Return (markdown lines, products JSON section, figure entries).
+
+    ``price_cache`` holds already-coerced, non-null prices keyed by source column name.
+    """
+    lines: list[str] = []
+    figures: list[dict] = []
+    if products is None or len(products) == 0:
+        lines.append('## Products Summary')
+        lines.append('No product data available.')
+        lines.append('')
+        return lines, {}, figures
     lines.append('## Products Summary')
     lines.append(f"Total products: **{len(products)}**")
     prod_section = {
@@ -139,83 +286,93 @@ if products is not None and len(products) > 0:
         'outlier_price_ratio': None,
         'sources_top10': []
     }
-    if 'source' in products.columns:
-        ds = products['source'].nunique()
+    # One hash pass per column: value_counts feeds distinct count, top category and the top-10 table
+    src_vc = products['source'].value_counts() if 'source' in products.columns else None
+    if src_vc is not None:
+        ds = len(src_vc)
         lines.append(f"Distinct sources: **{ds}**")
         prod_section['distinct_sources'] = int(ds)
-    if 'category' in products.columns and products['category'].notna().any():
-        top_cat = products['category'].value_counts().idxmax()
-        lines.append(f"Top category: **{top_cat}**")
-        prod_section['top_category'] = top_cat
+    if 'category' in products.columns:
+        cat_vc = products['category'].value_counts()
+        if not cat_vc.empty:
+            top_cat = str(cat_vc.index[0])
+            lines.append(f"Top category: **{top_cat}**")
+            prod_section['top_category'] = top_cat
     price_col = None
     for cand in ['price','price_amount']:
         if cand in (products.columns):
             price_col = cand
             break
+    # Coerce and sort once; every price statistic below reads the same sorted float array
+    pnum = np.empty(0)
     if price_col:
-        pnum = pd.to_numeric(products[price_col], errors='coerce')
-        if pnum.notna().any():
-            price_stats = {
-                'min': float(pnum.min()),
-                'median': float(pnum.median()),
-                'mean': float(pnum.mean()),
-                'p90': float(pnum.quantile(0.90)),
-                'max': float(pnum.max())
-            }
-            prod_section['price'] = price_stats
-            lines.append(f"Price min: **{price_stats['min']:.2f}** | median: **{price_stats['median']:.2f}** | mean: **{price_stats['mean']:.2f}** | p90: **{price_stats['p90']:.2f}** | max: **{price_stats['max']:.2f}**")
+        pnum = _cached_values(price_cache, price_col)
+        if pnum is None:
+            pnum = to_float(products[price_col]).dropna().to_numpy(dtype='float64')
+        pnum = np.sort(pnum)
+    if pnum.size:
+        p_min, q1, p_med, q3, p90, p_max = sorted_quantiles(pnum, PRICE_QUANTILES)
+        price_stats = {
+            'min': float(p_min),
+            'median': float(p_med),
+            'mean': float(pnum.mean()),
+            'p90': float(p90),
+            'max': float(p_max)
+        }
+        prod_section['price'] = price_stats
+        lines.append(f"Price min: **{price_stats['min']:.2f}** | median: **{price_stats['median']:.2f}** | mean: **{price_stats['mean']:.2f}** | p90: **{price_stats['p90']:.2f}** | max: **{price_stats['max']:.2f}**")
     # Duplicate logical key ratio
     if all(c in products.columns for c in ['source','source_id']):
-        key_counts = products.groupby(['source','source_id']).size().reset_index(name='dup_count')
-        dup_pairs = (key_counts['dup_count'] > 1).sum()
+        key_counts = logical_key_counts(products)
+        dup_pairs = int((key_counts > 1).sum())
         ratio = dup_pairs/len(key_counts) if len(key_counts)>0 else 0.0
         lines.append(f"Duplicate logical key pairs: **{dup_pairs}** ({ratio:.2%} of keys)")
         prod_section['duplicate_logical_key_pairs'] = int(dup_pairs)
         prod_section['duplicate_logical_key_ratio'] = float(ratio)
-    # Outlier detection (IQR) using the resolved price column
-    if price_col:
-        pnum = pd.to_numeric(products[price_col], errors='coerce')
-        if pnum.notna().sum() > 5:
-            q1 = pnum.quantile(0.25)
-            q3 = pnum.quantile(0.75)
-            iqr = q3 - q1 if (q3 - q1) != 0 else 1.0
-            upper = q3 + 1.5 * iqr
-            lower = q1 - 1.5 * iqr
-            outlier_ratio = ((pnum > upper) | (pnum < lower)).mean()
-            lines.append(f"Outlier price ratio (IQR fence): **{outlier_ratio:.2%}** (lower={lower:.2f}, upper={upper:.2f})")
-            prod_section['outlier_price_ratio'] = float(outlier_ratio)
-            prod_section['price']['iqr'] = float(iqr)
-            prod_section['price']['fence_lower'] = float(lower)
-            prod_section['price']['fence_upper'] = float(upper)
+    # Outlier detection (IQR) reusing the quartiles computed above
+    if pnum.size > 5:
+        iqr = q3 - q1 if (q3 - q1) != 0 else 1.0
+        upper = q3 + 1.5 * iqr
+        lower = q1 - 1.5 * iqr
+        # Ratio over all rows (non-numeric prices count as non-outliers); fences are binary-searched in the sorted array
+        n_out = np.searchsorted(pnum, lower, side='left') + (pnum.size - np.searchsorted(pnum, upper, side='right'))
+        outlier_ratio = int(n_out) / len(products)
+        lines.append(f"Outlier price ratio (IQR fence): **{outlier_ratio:.2%}** (lower={lower:.2f}, upper={upper:.2f})")
+        prod_section['outlier_price_ratio'] = float(outlier_ratio)
+        prod_section['price']['iqr'] = float(iqr)
+        prod_section['price']['fence_lower'] = float(lower)
+        prod_section['price']['fence_upper'] = float(upper)
 
     # Breakdown by source (top 10)
-    if 'source' in products.columns:
-        src_counts = products['source'].value_counts().head(10)
+    if src_vc is not None:
+        src_counts = src_vc.head(10)
         lines.append('\n**Products by Source (Top 10)**')
         lines.append('\n')
-        lines.append('| Source | Count | % |')
-        lines.append('|--------|-------|----|')
-        total_prod = len(products)
-        for s, c in src_counts.items():
-            pct = c/total_prod if total_prod else 0.0
-            lines.append(f"| {s} | {c} | {pct:.2%} |")
-            prod_section['sources_top10'].append({'source': s, 'count': int(c), 'ratio': pct})
+        table, prod_section['sources_top10'] = count_table(src_counts, len(products), 'Source', 'source')
+        lines += table
 
     # Link to figure
     fig_price = FIG_DIR / 'products_price_distributions.png'
     if fig_price.exists():
-        rel_path = os.path.relpath(fig_price, REPORTS_DIR).replace('\\','/')
-        lines.append(f"![Product Price Distributions]({rel_path})")
-        json_report['figures'].append({'name': fig_price.name, 'path': rel_path, 'section': 'products'})
-    lines.append('')
-    json_report['products'] = prod_section
-else:
-    lines.append('## Products Summary')
-    lines.append('No product data available.')
+        entry = _figure_entry(fig_price, 'products')
+        lines.append(f"![Product Price Distributions]({entry['path']})")
+        figures.append(entry)
     lines.append('')
+    return lines, prod_section, figures
+
 
-# --- Order KPIs ---
-if orders is not None and len(orders) > 0:
+def compute_orders_kpis(orders: pd.DataFrame | None, value_cache: pd.DataFrame | None = None) -> tuple[list[str], dict, list[dict]]:
+    """Return (markdown lines, orders JSON section, figure entries).
+
+    ``value_cache`` holds already-coerced, non-null order values keyed by source column name.
+    """
+    lines: list[str] = []
+    figures: list[dict] = []
+    if orders is None or len(orders) == 0:
+        lines.append('## Orders Summary')
+        lines.append('No order data available.')
+        lines.append('')
+        return lines, {}, figures
     lines.append('## Orders Summary')
     lines.append(f"Total orders: **{len(orders)}**")
     ord_section = {
@@ -226,11 +383,11 @@ if orders is not None and len(orders) > 0:
     }
     # Date detection
     date_col = None
-    for c in ['created_at','order_date','date','timestamp']:
+    for c in ORDER_DATE_CANDIDATES:
         if c in orders.columns:
             date_col = c; break
     value_col = None
-    for c in ['total_price','total','amount','grand_total','price']:
+    for c in ORDER_VALUE_CANDIDATES:
         if c in orders.columns:
             value_col = c; break
     if date_col:
@@ -240,8 +397,9 @@ if orders is not None and len(orders) > 0:
             lines.append(f"Timespan (days): **{span_days}**")
             ord_section['timespan_days'] = int(span_days)
     if value_col:
-        oval = pd.to_numeric(orders[value_col], errors='coerce')
-        if oval.notna().any():
+        cached = _cached_values(value_cache, value_col)
+        oval = pd.Series(cached) if cached is not None else to_float(orders[value_col]).dropna()
+        if not oval.empty:
             gmv_stats = {'total': float(oval.sum()), 'mean': float(oval.mean()), 'median': float(oval.median())}
             ord_section['gmv'] = gmv_stats
             lines.append(f"GMV total: **{gmv_stats['total']:.2f}** | mean: **{gmv_stats['mean']:.2f}** | median: **{gmv_stats['median']:.2f}**")
@@ -250,159 +408,157 @@ if orders is not None and len(orders) > 0:
         src_counts = orders['source'].value_counts().head(10)
         lines.append('\n**Orders by Source (Top 10)**')
         lines.append('\n')
-        lines.append('| Source | Count | % |')
-        lines.append('|--------|-------|----|')
-        total_ord = len(orders)
-        for s, c in src_counts.items():
-            pct = c/total_ord if total_ord else 0.0
-            lines.append(f"| {s} | {c} | {pct:.2%} |")
-            ord_section['sources_top10'].append({'source': s, 'count': int(c), 'ratio': pct})
+        table, ord_section['sources_top10'] = count_table(src_counts, len(orders), 'Source', 'source')
+        lines += table
 
     fig_ts = FIG_DIR / 'orders_time_series.png'
     if fig_ts.exists():
-        rel_path = os.path.relpath(fig_ts, REPORTS_DIR).replace('\\','/')
-        lines.append(f"![Orders Time Series]({rel_path})")
-        json_report['figures'].append({'name': fig_ts.name, 'path': rel_path, 'section': 'orders'})
+        entry = _figure_entry(fig_ts, 'orders')
+        lines.append(f"![Orders Time Series]({entry['path']})")
+        figures.append(entry)
     fig_aov = FIG_DIR / 'orders_aov_distribution.png'
     if fig_aov.exists():
-        rel_path = os.path.relpath(fig_aov, REPORTS_DIR).replace('\\','/')
-        lines.append(f"![AOV Distribution]({rel_path})")
-        json_report['figures'].append({'name': fig_aov.name, 'path': rel_path, 'section': 'orders'})
-    lines.append('')
-    json_report['orders'] = ord_section
-else:
-    lines.append('## Orders Summary')
-    lines.append('No order data available.')
-    lines.append('')
-
-# --- Enriched Feature Highlights ---
-if products_enriched is not None and len(products_enriched) > 0:
-    lines.append('## Enriched Product Features')
-    cols = [c for c in products_enriched.columns if c.startswith('price_') or c.endswith('_freq')]
-    enr_prod = {'columns': cols}
-    if cols:
-        lines.append('Derived columns: ' + ', '.join(sorted(cols)[:15]) + (' ...' if len(cols)>15 else ''))
-    # Quantile bucket distribution if present
-    if 'price_bucket' in products_enriched.columns:
-        bucket_counts = products_enriched['price_bucket'].value_counts(dropna=False)
-        lines.append('\n**Price Bucket Distribution**')
-        lines.append('\n')
-        lines.append('| Bucket | Count | % |')
-        lines.append('|--------|-------|----|')
-        total = bucket_counts.sum()
-        bucket_arr = []
-        for b, c in bucket_counts.items():
-            ratio = c/total if total else 0.0
-            lines.append(f"| {b} | {c} | {ratio:.2%} |")
-            bucket_arr.append({'bucket': str(b), 'count': int(c), 'ratio': ratio})
-        enr_prod['price_bucket_distribution'] = bucket_arr
+        entry = _figure_entry(fig_aov, 'orders')
+        lines.append(f"![AOV Distribution]({entry['path']})")
+        figures.append(entry)
     lines.append('')
-    json_report.setdefault('enriched', {})['products'] = enr_prod
-if orders_enriched is not None and len(orders_enriched) > 0:
-    lines.append('## Enriched Order Features')
-    cols = [c for c in orders_enriched.columns if c.endswith('_7d') or c.startswith('recency') or c=='order_value_num']
-    if cols:
-        lines.append('Derived columns: ' + ', '.join(sorted(cols)))
-    enr_ord = {'columns': cols}
-    # Rolling metrics snapshot (latest row)
-    latest_metrics = {}
-    for mc in ['gmv_7d','orders_7d','aov_7d']:
-        if mc in orders_enriched.columns:
-            val = pd.to_numeric(orders_enriched[mc], errors='coerce').dropna()
-            if not val.empty:
-                latest_metrics[mc] = float(val.iloc[-1])
-    if latest_metrics:
-        lines.append('\nLatest rolling 7d metrics: ' + ', '.join(f"{k}={v:.2f}" for k,v in latest_metrics.items()))
-        enr_ord['latest_rolling_7d'] = latest_metrics
-    lines.append('')
-    json_report.setdefault('enriched', {})['orders'] = enr_ord
-
-# --- Comparative Narrative ---
-lines.append('## Comparative Narrative')
-_narrative_text = textwrap.dedent('''
-The product dataset establishes the commercial catalog footprint (source diversity, category concentration and price dispersion), while the
-orders dataset captures temporal demand and monetary performance. Provider (source) breakdowns reveal distribution of catalog and demand.
-
-Engineered features enable downstream tasks:
-- Price segmentation and elasticity exploration (`price_bucket`, `price_log`).
-- Supplier/source reliability & concentration (`source_freq`).
-- Momentum & short‑term commercial monitoring (`gmv_7d`, `orders_7d`, `aov_7d`).
-- Lifecycle / churn proxy via recency (`recency_days`).
-
-Data Quality & Risk Observations:
-- Outlier ratios contextualize pricing anomalies for potential cleansing or curation steps.
-- Duplicate logical key pairs (source + source_id) indicate upstream id uniformity or merge correctness.
-- Run log metrics (new_* vs updated_*) help track incremental ingestion health; rising updated/new ratio may signal dataset maturity or stagnation.
-
-Recommended Next Steps:
-1. Establish anomaly thresholds for price outliers and rolling GMV deltas.
-2. Persist daily aggregate tables for BI dashboards.
-3. Integrate simple forecasting (e.g., 7d GMV moving average horizon extension) for operations planning.
-''').strip()
-lines.append(_narrative_text)
-json_report['narrative'] = {
-    'summary': _narrative_text.split('\n')[0].strip(),
-    'details': _narrative_text
-}
-lines.append('')
-
-# --- Run Logs Section ---
-if run_logs:
+    return lines, ord_section, figures
+
+
+def compute_enriched_highlights(products_enriched: pd.DataFrame | None, orders_enriched: pd.DataFrame | None,
+                                products_enriched_cols: list[str], orders_enriched_cols: list[str]) -> tuple[list[str], dict]:
+    """``*_cols`` are the derived column names read from the input schema."""
+    lines: list[str] = []
+    enriched: dict = {}
+    if products_enriched is not None and len(products_enriched) > 0:
+        lines.append('## Enriched Product Features')
+        cols = products_enriched_cols
+        enr_prod = {'columns': cols}
+        if cols:
+            lines.append('Derived columns: ' + ', '.join(sorted(cols)[:15]) + (' ...' if len(cols)>15 else ''))
+        # Quantile bucket distribution if present
+        if 'price_bucket' in products_enriched.columns:
+            bucket_counts = products_enriched['price_bucket'].value_counts(dropna=False)
+            lines.append('\n**Price Bucket Distribution**')
+            lines.append('\n')
+            table, enr_prod['price_bucket_distribution'] = count_table(bucket_counts, bucket_counts.sum(), 'Bucket', 'bucket')
+            lines += table
+        lines.append('')
+        enriched['products'] = enr_prod
+    if orders_enriched is not None and len(orders_enriched) > 0:
+        lines.append('## Enriched Order Features')
+        cols = orders_enriched_cols
+        if cols:
+            lines.append('Derived columns: ' + ', '.join(sorted(cols)))
+        enr_ord = {'columns': cols}
+        # Rolling metrics snapshot (latest row)
+        latest_metrics = {}
+        for mc in ['gmv_7d','orders_7d','aov_7d']:
+            if mc in orders_enriched.columns:
+                val = to_float(orders_enriched[mc]).dropna()
+                if not val.empty:
+                    latest_metrics[mc] = float(val.iloc[-1])
+        if latest_metrics:
+            lines.append('\nLatest rolling 7d metrics: ' + ', '.join(f"{k}={v:.2f}" for k,v in latest_metrics.items()))
+            enr_ord['latest_rolling_7d'] = latest_metrics
+        lines.append('')
+        enriched['orders'] = enr_ord
+    return lines, enriched
+
+
+def build_narrative() -> tuple[list[str], dict]:
+    lines = ['## Comparative Narrative', _NARRATIVE_TEXT, '']
+    narrative = {
+        'summary': _NARRATIVE_TEXT.split('\n')[0].strip(),
+        'details': _NARRATIVE_TEXT
+    }
+    return lines, narrative
+
+
+def summarize_run_logs(path: Path = RUN_LOG) -> tuple[list[str], dict]:
+    """Single streaming pass over the run log: running sums + last record, no DataFrame."""
+    lines: list[str] = []
+    summary: dict = {}
+    if not path.exists():
+        return lines, summary
+    total_runs = 0
+    sums = dict.fromkeys(RUN_METRIC_KEYS, 0)
+    seen: set[str] = set()
+    last: dict = {}
+    with path.open('rb') as f:
+        for raw in f:
+            if not raw.strip():
+                continue
+            try:
+                rec = _json_loads(raw)
+            except ValueError:
+                continue
+            if not isinstance(rec, dict):
+                continue
+            total_runs += 1
+            last = rec
+            for k in RUN_METRIC_KEYS:
+                v = rec.get(k)
+                if k in rec:
+                    seen.add(k)
+                if isinstance(v, (int, float)) and v == v:  # skip NaN like pandas sum
+                    sums[k] += v
+    if not total_runs:
+        return lines, summary
     lines.append('## Pipeline Run Logs Overview')
-    # Convert to DataFrame for summarization
-    rldf = pd.DataFrame(run_logs)
-    # Basic counts
-    lines.append(f"Total recorded runs: **{len(rldf)}**")
-    # Metrics presence
-    metric_cols = [c for c in ['new_products','updated_products','new_orders','updated_orders'] if c in rldf.columns]
+    lines.append(f"Total recorded runs: **{total_runs}**")
+    metric_cols = [k for k in RUN_METRIC_KEYS if k in seen]
     if metric_cols:
         # Last run snapshot
-        last = rldf.tail(1).iloc[0]
-        snapshot = ', '.join(f"{m}={last[m]}" for m in metric_cols)
+        snapshot = ', '.join(f"{m}={last.get(m)}" for m in metric_cols)
         lines.append(f"Latest run metrics: {snapshot}")
-        # Aggregate sums
-        sums = rldf[metric_cols].sum(numeric_only=True)
-        lines.append('Cumulative ingest stats: ' + ', '.join(f"{k}={int(v)}" for k,v in sums.items()))
+        lines.append('Cumulative ingest stats: ' + ', '.join(f"{m}={int(sums[m])}" for m in metric_cols))
         # Updated/New ratios
-        ratios = []
+        ratios = {}
         if 'updated_products' in metric_cols and 'new_products' in metric_cols:
-            new_p = rldf['new_products'].sum() or 1
-            ratios.append(f"products_update_ratio={rldf['updated_products'].sum()/new_p:.2f}")
+            ratios['products_update_ratio'] = round(sums['updated_products'] / (sums['new_products'] or 1), 2)
         if 'updated_orders' in metric_cols and 'new_orders' in metric_cols:
-            new_o = rldf['new_orders'].sum() or 1
-            ratios.append(f"orders_update_ratio={rldf['updated_orders'].sum()/new_o:.2f}")
+            ratios['orders_update_ratio'] = round(sums['updated_orders'] / (sums['new_orders'] or 1), 2)
         if ratios:
-            lines.append('Update/New ratios: ' + ', '.join(ratios))
-        json_report['run_logs'] = {
-            'total_runs': int(len(rldf)),
-            'latest': {m: last[m] for m in metric_cols},
+            lines.append('Update/New ratios: ' + ', '.join(f"{k}={v:.2f}" for k, v in ratios.items()))
+        summary = {
+            'total_runs': total_runs,
+            'latest': {m: last.get(m) for m in metric_cols},
             'cumulative': {m: int(sums[m]) for m in metric_cols},
-            'ratios': {r.split('=')[0]: float(r.split('=')[1]) for r in ratios}
+            'ratios': ratios
         }
     lines.append('')
+    return lines, summary
 
 
-# --- Data Availability Matrix ---
-lines.append('## Data Availability Matrix')
-lines.append('| Dataset | Rows | Enriched |')
-lines.append('|---------|------|----------|')
-prod_rows = 0 if products is None else len(products)
-ord_rows = 0 if orders is None else len(orders)
-prod_enr = (products_enriched is not None and len(products_enriched)>0)
-ord_enr = (orders_enriched is not None and len(orders_enriched)>0)
-lines.append(f"| Products | {prod_rows} | {'Yes' if prod_enr else 'No'} |")
-lines.append(f"| Orders | {ord_rows} | {'Yes' if ord_enr else 'No'} |")
-json_report['data_availability'] = {
-    'products_rows': prod_rows,
-    'orders_rows': ord_rows,
-    'products_enriched': bool(prod_enr),
-    'orders_enriched': bool(ord_enr)
-}
-lines.append('')
+def build_data_availability(products, orders, products_enriched, orders_enriched) -> tuple[list[str], dict]:
+    lines = ['## Data Availability Matrix', '| Dataset | Rows | Enriched |', '|---------|------|----------|']
+    prod_rows = 0 if products is None else len(products)
+    ord_rows = 0 if orders is None else len(orders)
+    prod_enr = (products_enriched is not None and len(products_enriched)>0)
+    ord_enr = (orders_enriched is not None and len(orders_enriched)>0)
+    lines.append(f"| Products | {prod_rows} | {'Yes' if prod_enr else 'No'} |")
+    lines.append(f"| Orders | {ord_rows} | {'Yes' if ord_enr else 'No'} |")
+    lines.append('')
+    availability = {
+        'products_rows': prod_rows,
+        'orders_rows': ord_rows,
+        'products_enriched': bool(prod_enr),
+        'orders_enriched': bool(ord_enr)
+    }
+    return lines, availability
 
-# --- KPI Rollup (for strict JSON schema) ---
-try:
-    # Build KPI dict safely from earlier computed sections
+
+def _safe_int(x, factor: float = 1) -> int | None:
+    """``round(float(x) * factor)`` as an int; None if ``x`` is not numeric."""
+    try:
+        return int(round(float(x) * factor))
+    except (TypeError, ValueError):
+        return None
+
+
+def build_kpis(json_report: dict) -> dict:
+    """KPI rollup (for strict JSON schema) derived from the computed sections."""
     kpis = {}
     prod = json_report.get('products') or {}
     ords = json_report.get('orders') or {}
@@ -418,13 +574,11 @@ try:
     kpis['products_new'] = None  # not tracked here (pipeline run logs aggregate), left optional
     kpis['products_updated'] = None
     # Derive absolute outlier count from ratio * total (rounded) if available
-    try:
-        if isinstance(prod, dict) and prod.get('outlier_price_ratio') is not None and prod.get('count') is not None:
-            kpis['products_outliers_price'] = int(round(float(prod['outlier_price_ratio']) * int(prod['count'])))
-        else:
-            kpis['products_outliers_price'] = None
-    except Exception:
-        kpis['products_outliers_price'] = None
+    kpis['products_outliers_price'] = None
+    if isinstance(prod, dict) and prod.get('outlier_price_ratio') is not None and prod.get('count') is not None:
+        total = _safe_int(prod['count'])
+        if total is not None:
+            kpis['products_outliers_price'] = _safe_int(prod['outlier_price_ratio'], total)
     kpis['orders_total'] = ords.get('count') if isinstance(ords, dict) else 0
     o_by_provider = {}
     for item in ords.get('sources_top10', []) or []:
@@ -434,81 +588,154 @@ try:
     kpis['orders_outliers_total'] = None
     kpis['aov_mean'] = gmv_stats.get('mean') if isinstance(gmv_stats, dict) else None
     kpis['aov_median'] = gmv_stats.get('median') if isinstance(gmv_stats, dict) else None
-    json_report['kpis'] = kpis
-except Exception as _kpi_err:
-    json_report['kpis'] = {'error': str(_kpi_err)}
-
-# Write file
-missing_essentials = []
-if products is None:
-    missing_essentials.append('products')
-if orders is None:
-    missing_essentials.append('orders')
-
-if args.fail_on_missing and missing_essentials:
-    print('Missing essential datasets:', ', '.join(missing_essentials), file=sys.stderr)
-    sys.exit(2)
-
-if not args.json_only:
-    if OUTPUT_MD.exists():
-        backup_path = OUTPUT_MD.parent / f"{OUTPUT_MD.name}.backup_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
-        backup_path.write_text(OUTPUT_MD.read_text(encoding='utf-8'), encoding='utf-8')
-    print('Backup created at', backup_path)
-    OUTPUT_MD.write_text('\n'.join(lines), encoding='utf-8')
-    print('Markdown report written to', OUTPUT_MD)
-else:
-    print('Markdown preserved (flag --json-only).')
+    return kpis
 
-if not args.md_only:
-    # Add figure metadata (size + sha256) before writing JSON
+
+def add_figure_metadata(json_report: dict) -> None:
+    """Attach size + sha256 to each figure and record the integrity summary."""
     for fig in json_report.get('figures', []):
         fp = REPORTS_DIR / fig['path']
         if fp.exists():
             try:
-                blob = fp.read_bytes()
-                fig['size_bytes'] = len(blob)
-                fig['sha256'] = hashlib.sha256(blob).hexdigest()
+                # Stream the file through the digest instead of loading it into memory
+                with fp.open('rb') as fh:
+                    fig['sha256'] = hashlib.file_digest(fh, 'sha256').hexdigest()
+                fig['size_bytes'] = fp.stat().st_size
             except Exception:
                 pass
     # Integrity summary
     figs = json_report.get('figures', []) or []
-    expected = [
-        'products_price_distributions.png',
-        'orders_time_series.png',
-        'orders_aov_distribution.png'
-    ]
     present_ids = [f.get('name') for f in figs if isinstance(f, dict) and f.get('name')]
-    missing = [fid for fid in expected if fid not in present_ids]
+    missing = [fid for fid in EXPECTED_FIGURES if fid not in present_ids]
     json_report['integrity'] = {
         'figure_count': len(figs),
         'figure_ids': present_ids,
-        'expected_figures': expected,
+        'expected_figures': EXPECTED_FIGURES,
         'missing_figures': missing
     }
-    OUTPUT_JSON.write_text(json.dumps(json_report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+# --- Output ---
+
+def write_markdown(lines: list[str]) -> None:
+    if OUTPUT_MD.exists():
+        backup_path = OUTPUT_MD.parent / f"{OUTPUT_MD.name}.backup_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
+        backup_path.write_text(OUTPUT_MD.read_text(encoding='utf-8'), encoding='utf-8')
+        print('Backup created at', backup_path)
+    # Stream lines through a 1 MiB buffer instead of materialising one joined string
+    with OUTPUT_MD.open('w', encoding='utf-8', buffering=1 << 20) as fh:
+        W = fh.write
+        for i, line in enumerate(lines):
+            if i:
+                W('\n')
+            W(line)
+    print('Markdown report written to', OUTPUT_MD)
+
+
+def write_json(json_report: dict) -> None:
+    if orjson is not None:
+        OUTPUT_JSON.write_bytes(orjson.dumps(json_report, option=orjson.OPT_INDENT_2))
+    else:
+        OUTPUT_JSON.write_text(json.dumps(json_report, ensure_ascii=False, indent=2), encoding='utf-8')
     print('JSON report written to', OUTPUT_JSON)
 
+
+def validate_json() -> int:
+    """Validate OUTPUT_JSON against the schema; returns a process exit code."""
+    if not SCHEMA_PATH.exists():
+        print('[validate] Schema file not found at', SCHEMA_PATH, file=sys.stderr)
+        return 3
+    try:
+        import jsonschema  # type: ignore
+    except ImportError:
+        print('[validate] jsonschema package not installed. Add to requirements.txt to enable validation.', file=sys.stderr)
+        return 4
+    try:
+        schema = json.loads(SCHEMA_PATH.read_text(encoding='utf-8'))
+        data_obj = json.loads(OUTPUT_JSON.read_text(encoding='utf-8'))
+        jsonschema.validate(instance=data_obj, schema=schema)
+        print('[validate] JSON schema validation: PASS')
+    except jsonschema.ValidationError as ve:
+        print('[validate] JSON schema validation FAILED:', ve.message, file=sys.stderr)
+        return 5
+    except Exception as e:
+        print('[validate] Unexpected validation error:', e, file=sys.stderr)
+        return 6
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.json_only and args.md_only:
+        print('Error: do not use --json-only and --md-only together.', file=sys.stderr)
+        return 1
+
+    products_path = find_input(DATA_NORM / 'products.parquet', DATA_NORM / 'products.csv')
+    orders_path = find_input(DATA_NORM / 'orders.parquet', DATA_NORM / 'orders.csv')
+    products = load_df(DATA_NORM / 'products.parquet', DATA_NORM / 'products.csv', REQUIRED_COLS['products'])
+    orders = load_df(DATA_NORM / 'orders.parquet', DATA_NORM / 'orders.csv', REQUIRED_COLS['orders'])
+
+    missing_essentials = []
+    if products is None:
+        missing_essentials.append('products')
+    if orders is None:
+        missing_essentials.append('orders')
+    if args.fail_on_missing and missing_essentials:
+        print('Missing essential datasets:', ', '.join(missing_essentials), file=sys.stderr)
+        return 2
+
+    products_enriched, products_enriched_cols = load_enriched(
+        DATA_ENRICHED / 'products_enriched.parquet', DATA_ENRICHED / 'products_enriched.csv',
+        is_products_enriched_col, ENRICHED_AGG_COLS['products'])
+    orders_enriched, orders_enriched_cols = load_enriched(
+        DATA_ENRICHED / 'orders_enriched.parquet', DATA_ENRICHED / 'orders_enriched.csv',
+        is_orders_enriched_col, ENRICHED_AGG_COLS['orders'])
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    json_report = new_json_report()
+    lines = build_header()
+
+    section_lines, json_report['products'], figs = compute_products_kpis(
+        products, None if args.no_cache else read_kpi_cache('price_num', products_path))
+    lines += section_lines
+    json_report['figures'].extend(figs)
+
+    section_lines, json_report['orders'], figs = compute_orders_kpis(
+        orders, None if args.no_cache else read_kpi_cache('aov', orders_path))
+    lines += section_lines
+    json_report['figures'].extend(figs)
+
+    section_lines, enriched = compute_enriched_highlights(products_enriched, orders_enriched, products_enriched_cols, orders_enriched_cols)
+    lines += section_lines
+    json_report['enriched'].update(enriched)
+
+    section_lines, json_report['narrative'] = build_narrative()
+    lines += section_lines
+
+    section_lines, run_log_summary = summarize_run_logs()
+    lines += section_lines
+    if run_log_summary:
+        json_report['run_logs'] = run_log_summary
+
+    section_lines, json_report['data_availability'] = build_data_availability(products, orders, products_enriched, orders_enriched)
+    lines += section_lines
+
+    json_report['kpis'] = build_kpis(json_report)
+
+    if not args.json_only:
+        write_markdown(lines)
+    else:
+        print('Markdown preserved (flag --json-only).')
+
+    if args.md_only:
+        print('JSON skipped (flag --md-only).')
+        return 0
+
+    add_figure_metadata(json_report)
+    write_json(json_report)
     if args.validate:
-        schema_path = PROJECT_ROOT / 'schemas' / 'comparative_report.schema.json'
-        if not schema_path.exists():
-            print('[validate] Schema file not found at', schema_path, file=sys.stderr)
-            sys.exit(3)
-        try:
-            import jsonschema  # type: ignore
-        except ImportError:
-            print('[validate] jsonschema package not installed. Add to requirements.txt to enable validation.', file=sys.stderr)
-            sys.exit(4)
-        try:
-            schema = json.loads(schema_path.read_text(encoding='utf-8'))
-            data_obj = json.loads(OUTPUT_JSON.read_text(encoding='utf-8'))
-            jsonschema.validate(instance=data_obj, schema=schema)
-            print('[validate] JSON schema validation: PASS')
-        except jsonschema.ValidationError as ve:
-            print('[validate] JSON schema validation FAILED:', ve.message, file=sys.stderr)
-            sys.exit(5)
-        except Exception as e:
-            print('[validate] Unexpected validation error:', e, file=sys.stderr)
-            sys.exit(6)
-else:
-    print('JSON skipped (flag --md-only).')
+        return validate_json()
+    return 0
+
 
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,35 @@
 
 This script is idempotent: it will regenerate PNGs under reports/figures.
 It expects that normalized and enriched data already exist.
+
+The three figures are independent, so each one is rendered in its own worker
+process; workers receive only the input path and load the data themselves.
+
+Each PNG has a ``<name>.png.hash`` sidecar holding a digest of the data it was
+drawn from and the render settings (RENDER_VERSION, library versions, rcParams);
+when the digest is unchanged the figure is not re-rendered (``--force``
+re-renders regardless).
 """
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import argparse, hashlib
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless; select before pyplot so no GUI backend is imported
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+try:  # imported as scripts.<module> (python -m, tests, pipelines)
+    from scripts._report_io import (
+        ORDER_DATE_CANDIDATES, ORDER_VALUE_CANDIDATES, read_table, to_float, write_kpi_cache,
+    )
+except ImportError:  # run as a script: scripts/ itself is on sys.path
+    from _report_io import (
+        ORDER_DATE_CANDIDATES, ORDER_VALUE_CANDIDATES, read_table, to_float, write_kpi_cache,
+    )
+
 ROOT = Path(__file__).resolve().parent.parent
 DATA_NORM = ROOT / 'data' / 'normalized'
 DATA_ENRICHED = ROOT / 'data' / 'enriched'
@@ -20,70 +42,196 @@ ORDERS_PATH = DATA_NORM / 'orders.parquet'
 PRODUCTS_ENRICHED_PATH = DATA_ENRICHED / 'products_enriched.parquet'
 ORDERS_ENRICHED_PATH = DATA_ENRICHED / 'orders_enriched.parquet'
 
+# Daily series longer than this are LTTB-decimated to TS_MAX_POINTS before plotting
+TS_DECIMATE_ABOVE = 1500
+TS_MAX_POINTS = 1000
+
+RC_PARAMS = {
+    'path.simplify': True,
+    'agg.path.chunksize': 10000,
+    'figure.max_open_warning': 0,
+    'axes.formatter.useoffset': False,
+}
+plt.rcParams.update(RC_PARAMS)
 
-def load(path: Path):
-    if path.exists():
-        if path.suffix == '.parquet':
-            return pd.read_parquet(path)
-        else:
-            return pd.read_csv(path)
+# Mixed into every figure digest so a drawing change invalidates the cached PNGs.
+# Bump RENDER_VERSION whenever a figure's styling, bins, labels or sizes change.
+RENDER_VERSION = 2
+_RENDER_KEY = f'{RENDER_VERSION}|{matplotlib.__version__}|{sns.__version__}|{sorted(RC_PARAMS.items())}'
+
+
+def _first_present(columns, candidates: list[str]) -> str | None:
+    for c in candidates:
+        if c in columns:
+            return c
     return None
 
-products = load(PRODUCTS_PATH)
-orders = load(ORDERS_PATH)
-products_enriched = load(PRODUCTS_ENRICHED_PATH)
-orders_enriched = load(ORDERS_ENRICHED_PATH)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling to ``n_out`` points."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    bucket = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start, end = int(i * bucket) + 1, int((i + 1) * bucket) + 1
+        nxt_end = min(int((i + 2) * bucket) + 1, n)
+        avg_x, avg_y = x[end:nxt_end].mean(), y[end:nxt_end].mean()
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def content_hash(*parts: np.ndarray | str) -> str:
+    """blake2b digest over the render settings plus the raw buffers of the arrays (and text labels) a figure is drawn from."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_RENDER_KEY.encode())
+    for part in parts:
+        h.update(part.encode() if isinstance(part, str) else np.ascontiguousarray(part).data)
+    return h.hexdigest()
+
+
+def _hash_path(outfile: Path) -> Path:
+    return outfile.with_name(outfile.name + '.hash')
+
+
+def is_current(outfile: Path, digest: str) -> bool:
+    try:
+        return outfile.exists() and _hash_path(outfile).read_text().strip() == digest
+    except FileNotFoundError:
+        return False
+
+
+def _save(outfile: Path, digest: str) -> None:
+    plt.tight_layout()
+    plt.savefig(outfile, dpi=130)
+    plt.close('all')
+    _hash_path(outfile).write_text(digest + '\n')
+
 
 # 1. Product Price Distributions
-if products is not None and len(products) > 0:
+def render_price_dist(path: Path, force: bool = False) -> str | None:
+    products = read_table(path)
+    if products is None or len(products) == 0:
+        return None
     price_col = 'price'
     if 'price_amount' in products.columns:
         price_col = 'price_amount'
-    pnum = pd.to_numeric(products[price_col], errors='coerce')
+    pnum = to_float(products[price_col])
     pnum = pnum[pnum.notna()]
-    if not pnum.empty:
-        plt.figure(figsize=(10,4))
-        sns.histplot(pnum, bins=40, kde=True, color='#2563eb')
-        plt.title('Product Price Distribution')
-        plt.xlabel('Price')
-        plt.tight_layout()
-        outfile = FIG_DIR / 'products_price_distributions.png'
-        plt.savefig(outfile, dpi=130)
-        plt.close()
-
-# 2. Orders Time Series & AOV Distribution
-if orders is not None and len(orders) > 0:
-    # Detect date column
-    date_col = None
-    for c in ['created_at','order_date','date','timestamp']:
-        if c in orders.columns:
-            date_col = c; break
-    val_col = None
-    for c in ['total_price','total','amount','grand_total','price']:
-        if c in orders.columns:
-            val_col = c; break
-    if date_col:
-        od = orders[[date_col]].copy()
-        od[date_col] = pd.to_datetime(od[date_col], errors='coerce')
-        daily = od.groupby(od[date_col].dt.date).size()
-        if not daily.empty:
-            plt.figure(figsize=(10,4))
-            daily.plot(marker='o')
-            plt.title('Orders Count per Day')
-            plt.ylabel('Orders')
-            plt.xlabel('Date')
-            plt.tight_layout()
-            plt.savefig(FIG_DIR / 'orders_time_series.png', dpi=130)
-            plt.close()
-    if val_col:
-        v = pd.to_numeric(orders[val_col], errors='coerce').dropna()
-        if not v.empty:
-            plt.figure(figsize=(10,4))
-            sns.histplot(v, bins=40, kde=True, color='#7c3aed')
-            plt.title('Order AOV Distribution')
-            plt.xlabel(val_col)
-            plt.tight_layout()
-            plt.savefig(FIG_DIR / 'orders_aov_distribution.png', dpi=130)
-            plt.close()
-
-print('Figures generated under', FIG_DIR)
+    if pnum.empty:
+        return None
+    values = pnum.to_numpy(dtype='float64')
+    write_kpi_cache('price_num', pd.DataFrame({price_col: values}))
+    outfile = FIG_DIR / 'products_price_distributions.png'
+    digest = content_hash(values)
+    if not force and is_current(outfile, digest):
+        return outfile.name
+    plt.figure(figsize=(10,4), clear=True)
+    sns.histplot(pnum, bins=40, kde=True, color='#2563eb')
+    plt.title('Product Price Distribution')
+    plt.xlabel('Price')
+    _save(outfile, digest)
+    return outfile.name
+
+
+# 2. Orders Time Series
+def render_timeseries(path: Path, force: bool = False) -> str | None:
+    orders = read_table(path)
+    if orders is None or len(orders) == 0:
+        return None
+    date_col = _first_present(orders.columns, ORDER_DATE_CANDIDATES)
+    if not date_col:
+        return None
+    ts = pd.to_datetime(orders[date_col], errors='coerce').dropna()
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)  # bucket on local wall-clock days, like .dt.date
+    if ts.empty:
+        return None
+    # Integer day numbers + bincount instead of a groupby over Python date objects
+    days = ts.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    first_day = days.min()
+    counts = np.bincount(days - first_day)
+    x = pd.date_range(pd.Timestamp(np.datetime64(int(first_day), 'D')), periods=len(counts), freq='D')
+    outfile = FIG_DIR / 'orders_time_series.png'
+    # Digest the full-resolution series; decimation below is deterministic
+    digest = content_hash(x.asi8, counts)
+    if not force and is_current(outfile, digest):
+        return outfile.name
+    sidecar = FIG_DIR / 'orders_time_series.parquet'
+    if len(counts) > TS_DECIMATE_ABOVE:
+        # Keep the full-resolution series as a sidecar, plot a decimated one
+        pd.DataFrame({'date': x, 'orders': counts}).to_parquet(sidecar, index=False)
+        keep = lttb_indices(np.arange(len(counts)), counts, TS_MAX_POINTS)
+        x, counts = x[keep], counts[keep]
+    else:
+        sidecar.unlink(missing_ok=True)  # a previous, longer series may have left one behind
+    plt.figure(figsize=(10,4), clear=True)
+    plt.plot(x, counts, marker='o')
+    plt.title('Orders Count per Day')
+    plt.ylabel('Orders')
+    plt.xlabel('Date')
+    _save(outfile, digest)
+    return outfile.name
+
+
+# 3. Order AOV Distribution
+def render_aov(path: Path, force: bool = False) -> str | None:
+    orders = read_table(path)
+    if orders is None or len(orders) == 0:
+        return None
+    val_col = _first_present(orders.columns, ORDER_VALUE_CANDIDATES)
+    if not val_col:
+        return None
+    v = to_float(orders[val_col]).dropna()
+    if v.empty:
+        return None
+    values = v.to_numpy(dtype='float64')
+    write_kpi_cache('aov', pd.DataFrame({val_col: values}))
+    outfile = FIG_DIR / 'orders_aov_distribution.png'
+    digest = content_hash(val_col, values)
+    if not force and is_current(outfile, digest):
+        return outfile.name
+    plt.figure(figsize=(10,4), clear=True)
+    sns.histplot(v, bins=40, kde=True, color='#7c3aed')
+    plt.title('Order AOV Distribution')
+    plt.xlabel(val_col)
+    _save(outfile, digest)
+    return outfile.name
+
+
+TASKS = [
+    (render_price_dist, PRODUCTS_PATH),
+    (render_timeseries, ORDERS_PATH),
+    (render_aov, ORDERS_PATH),
+]
+
+
+def _dispatch(task) -> str | None:
+    fn, path, force = task
+    return fn(path, force)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Generate figures for the comparative report.')
+    parser.add_argument('--force', action='store_true', help='Re-render figures even if their input data is unchanged.')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    tasks = [(fn, path, args.force) for fn, path in TASKS]
+    with ProcessPoolExecutor(max_workers=len(tasks)) as ex:
+        list(ex.map(_dispatch, tasks))
+    print('Figures generated under', FIG_DIR)
+
+
+if __name__ == '__main__':
+    main()
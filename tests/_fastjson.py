@@ -0,0 +1,10 @@
+"""JSON parsing for the test suite: orjson when installed, stdlib json otherwise.
+
+Both accept bytes, so callers pass the raw file bytes directly.
+"""
+try:
+    import orjson as _j  # type: ignore
+except ImportError:  # stdlib fallback
+    import json as _j
+
+loads = _j.loads
@@ -0,0 +1,17 @@
+"""Project paths for the test suite, plus memoized filesystem checks.
+
+Paths are absolute (derived from this file), so tests behave the same from any CWD.
+The suite never creates or deletes the files it checks.
+"""
+import os
+from functools import lru_cache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(ROOT, 'reports')
+REPORT_JSON = os.path.join(REPORTS_DIR, 'comparative_report.json')
+SCHEMA_PATH = os.path.join(ROOT, 'schemas', 'comparative_report.schema.json')
+
+
+@lru_cache(maxsize=None)
+def _exists(p: str) -> bool:
+    return os.path.isfile(p)
@@ -1,6 +1,143 @@
 # Ensure project root is on sys.path for test imports
+import hashlib
+import os
 import sys
 from pathlib import Path
+import pytest
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from _fs import REPORT_JSON, SCHEMA_PATH
+
+# Deselected unless asked for with -m, or unless their file/node ID is named on the command line
+_OPT_IN_MARKERS = ('granular', 'slow')
+
+
+def pytest_collection_modifyitems(config, items):
+    # Default runs exercise the fused test_report_contract and skip scale tests
+    if config.option.markexpr:
+        return
+    invocation_dir = config.invocation_params.dir
+    named = {(invocation_dir / arg.partition('::')[0]).resolve() for arg in config.args}
+    keep, deselected = [], []
+    for item in items:
+        opt_in = any(item.get_closest_marker(m) for m in _OPT_IN_MARKERS)
+        if opt_in and item.path.resolve() not in named:
+            deselected.append(item)
+        else:
+            keep.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = keep
+
+
+def _read_if_exists(path: str) -> bytes | None:
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def _load_shared(cache: Path, raw: bytes):
+    """Parse the report once per xdist run: the first worker pickles it, the others unpickle.
+
+    The pickle is published with an atomic rename, so no lock is needed; workers
+    racing on the first parse just do the same work twice.
+    """
+    import pickle
+    from _fastjson import loads
+    try:
+        return pickle.loads(cache.read_bytes())
+    except FileNotFoundError:
+        data = loads(raw)
+        tmp = cache.with_name(f'{cache.name}.{os.getpid()}.tmp')
+        tmp.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, cache)
+        return data
+
+
+@pytest.fixture(scope='session')
+def raw_bytes():
+    """(report, schema) file contents, read concurrently once per session; None for a missing file.
+
+    Both reads are issued together from a thread pool (file reads release the GIL), so
+    cold-cache latency of the two files overlaps instead of adding up.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        report, schema = ex.map(_read_if_exists, (REPORT_JSON, SCHEMA_PATH))
+    return report, schema
+
+
+@pytest.fixture(scope='session')
+def report_data(raw_bytes, tmp_path_factory):
+    """comparative_report.json, parsed once per test session (once per run under xdist).
+
+    A missing or malformed report fails here, which errors every test that uses it.
+    """
+    raw = raw_bytes[0]
+    assert raw is not None, 'comparative_report.json does not exist – run generate_comparative_report.py first.'
+    # Parser (orjson or json) is imported on first use, not at collection
+    from _fastjson import loads
+    if os.environ.get('PYTEST_XDIST_WORKER') is None:
+        data = loads(raw)
+    else:
+        # Worker basetemps share a parent directory for the whole run
+        data = _load_shared(tmp_path_factory.getbasetemp().parent / 'report_data.pickle', raw)
+    assert isinstance(data, dict)
+    return data
+
+
+@pytest.fixture(scope='session')
+def schema_data(raw_bytes):
+    raw = raw_bytes[1]
+    assert raw is not None, 'Schema file missing. Expected at schemas/comparative_report.schema.json'
+    from _fastjson import loads
+    return loads(raw)
+
+
+@pytest.fixture(scope='session')
+def validate_report(schema_data, report_data):
+    """Zero-argument validator for the report, built once with the fastest draft-07 engine installed.
+
+    fastjsonschema compiles the schema to Python code; Draft7Validator is the fallback.
+    (python-rapidjson is not used: it implements only draft-04 and silently ignores newer
+    keywords.) Engines are imported here, not at module level, so collection stays cheap.
+    """
+    try:
+        import fastjsonschema  # type: ignore
+    except ImportError:  # interpreted jsonschema fallback below
+        pass
+    else:
+        validator = fastjsonschema.compile(schema_data)
+        return lambda: validator(report_data)
+    try:
+        from jsonschema import Draft7Validator  # type: ignore
+    except ImportError:
+        pytest.skip('jsonschema not installed in environment')
+    # The schema declares draft-07. One validator instance for the session: jsonschema.validate
+    # would re-check the schema and rebuild the validator/$ref resolver on every call.
+    validator = Draft7Validator(schema_data)
+    # validate will raise ValidationError if invalid
+    return lambda: validator.validate(report_data)
+
+
+@pytest.fixture
+def check_report_schema(pytestconfig, request, raw_bytes):
+    """Callable that validates the report against the schema.
+
+    A (report, schema) pair that validated before is not re-validated (cache lives in .pytest_cache).
+    """
+    def check():
+        h = hashlib.blake2b(digest_size=16)
+        for raw in raw_bytes:
+            h.update(raw or b'')
+        key = f'report/validated/{h.hexdigest()}'
+        cache = getattr(pytestconfig, 'cache', None)
+        if cache is not None and cache.get(key, False):
+            return
+        request.getfixturevalue('validate_report')()
+        if cache is not None:
+            cache.set(key, True)
+    return check
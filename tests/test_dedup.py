@@ -1,58 +1,62 @@
+import numpy as np
 import pandas as pd
+import pytest
 from pipelines.normalization import merge_products
 
+# The 100k case is a scale/regression check; run it with `pytest -m slow`
+SIZES = [2, 1_000, pytest.param(100_000, marks=pytest.mark.slow)]
 
-def _sample_products(version: int):
-    return [
-        {
-            'source': 'shopify',
-            'source_id': 'A',
-            'title': f'Prod A v{version}',
-            'price_amount': 10.0,
-            'price_currency': 'USD',
-            'image_url': None,
-            'category': 'cat',
-            'url': None,
-            'collected_at': f'2024-01-01T00:00:0{version}Z',
-            'raw_hash': f'hashA_{version}',
-            'raw_file': f'f{version}.json',
-            'additional': '{}'
-        },
-        {
-            'source': 'shopify',
-            'source_id': 'B',
-            'title': f'Prod B v{version}',
-            'price_amount': 12.0,
-            'price_currency': 'USD',
-            'image_url': None,
-            'category': 'cat',
-            'url': None,
-            'collected_at': f'2024-01-01T00:00:1{version}Z',
-            'raw_hash': f'hashB_{version}',
-            'raw_file': f'f{version}.json',
-            'additional': '{}'
-        }
-    ]
-
-
-def test_triple_mode_versions_accumulate():
+
+def _sample_products(version: int, n: int = 2):
+    """``n`` shopify products (SKU_0..SKU_{n-1}) at ``version``; a DataFrame above 1000 rows."""
+    source_ids = np.char.add('SKU_', np.arange(n).astype(str))
+    columns = {
+        'source': np.full(n, 'shopify'),
+        'source_id': source_ids,
+        'title': np.char.add(np.char.add('Prod ', source_ids), f' v{version}'),
+        'price_amount': np.full(n, 10.0),
+        'price_currency': np.full(n, 'USD'),
+        'image_url': np.full(n, None, dtype=object),
+        'category': np.full(n, 'cat'),
+        'url': np.full(n, None, dtype=object),
+        'collected_at': np.full(n, f'2024-01-01T00:00:0{version}Z'),
+        'raw_hash': np.char.add(np.char.add('hash', source_ids), f'_{version}'),
+        'raw_file': np.full(n, f'f{version}.json'),
+        'additional': np.full(n, '{}'),
+    }
+    if n > 1000:
+        return pd.DataFrame(columns)
+    return [dict(zip(columns, row)) for row in zip(*(col.tolist() for col in columns.values()))]
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_triple_mode_versions_accumulate(n):
     # First batch
-    df1, new1, upd1 = merge_products(None, _sample_products(1), key_mode='triple')
-    assert new1 == 2 and upd1 == 0
+    df1, new1, upd1 = merge_products(None, _sample_products(1, n), key_mode='triple')
+    assert new1 == n and upd1 == 0
     # Second batch with changed hashes (simulate updates)
-    df2, new2, upd2 = merge_products(df1, _sample_products(2), key_mode='triple')
+    df2, new2, upd2 = merge_products(df1, _sample_products(2, n), key_mode='triple')
     # In triple mode both new versions count as new
-    assert new2 == 2 and upd2 == 0
-    assert len(df2) == 4
+    assert new2 == n and upd2 == 0
+    assert len(df2) == 2 * n
 
 
-def test_pair_mode_overwrites():
-    df1, new1, upd1 = merge_products(None, _sample_products(1), key_mode='pair')
-    assert new1 == 2 and upd1 == 0 and len(df1) == 2
-    df2, new2, upd2 = merge_products(df1, _sample_products(2), key_mode='pair')
-    # Should overwrite both keys A & B -> 0 truly new, 2 updated
-    assert new2 == 0 and upd2 == 2
-    assert len(df2) == 2
+@pytest.mark.parametrize('n', SIZES)
+def test_pair_mode_overwrites(n):
+    df1, new1, upd1 = merge_products(None, _sample_products(1, n), key_mode='pair')
+    assert new1 == n and upd1 == 0 and len(df1) == n
+    df2, new2, upd2 = merge_products(df1, _sample_products(2, n), key_mode='pair')
+    # Should overwrite every key -> 0 truly new, n updated
+    assert new2 == 0 and upd2 == n
+    assert len(df2) == n
     # Titles should reflect version 2
     titles = set(df2['title'].tolist())
-    assert titles == {'Prod A v2','Prod B v2'}
+    assert titles == {f'Prod SKU_{i} v2' for i in range(n)}
+
+
+@pytest.mark.parametrize('key_mode', ['triple', 'pair'])
+def test_empty_second_batch_is_noop(key_mode):
+    df1, _, _ = merge_products(None, _sample_products(1), key_mode=key_mode)
+    df2, new2, upd2 = merge_products(df1, [], key_mode=key_mode)
+    assert new2 == 0 and upd2 == 0
+    assert len(df2) == len(df1)
@@ -0,0 +1,10 @@
+import importlib
+import pytest
+
+
+@pytest.mark.parametrize('module', ['scripts.generate_comparative_report', 'scripts.generate_figures'])
+def test_report_scripts_importable_as_modules(module):
+    # Both scripts are also run directly (scripts/ on sys.path); importing them from the
+    # project root must resolve the shared _report_io helpers too
+    mod = importlib.import_module(module)
+    assert mod.read_table.__module__ == 'scripts._report_io'